@@ -0,0 +1,41 @@
+"""
+Apply one audio filter config to many WAV clips in stacked batches.
+
+    python batch_audio.py config.json out_dir clip1.wav clip2.wav ...
+
+config.json uses the same {"audio": [...]} format as /configure. Each output
+is written to out_dir under its input's file name; a throughput report is
+printed as JSON.
+"""
+
+from collections import Counter
+from pathlib import Path
+import argparse
+import json
+
+from helpers import apply_audio_chain_batch
+from filters.audio import AUDIO_BATCH_FILTERS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch-apply an audio filter chain to WAV clips.")
+    parser.add_argument("config", help="Path to JSON config with an 'audio' list")
+    parser.add_argument("out_dir", help="Directory for processed clips")
+    parser.add_argument("inputs", nargs="+", help="Input WAV files")
+    parser.add_argument("--batch-size", type=int, default=64, help="Clips per stacked batch")
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    config = json.loads(Path(args.config).read_text())
+    for item in config.get("audio", []):
+        if item.get("name") not in AUDIO_BATCH_FILTERS:
+            parser.error(f"Unknown audio filter: {item.get('name')}")
+
+    wav_ins = [Path(p) for p in args.inputs]
+    wav_outs = [Path(args.out_dir) / p.name for p in wav_ins]
+    dups = sorted(p.name for p, n in Counter(wav_outs).items() if n > 1)
+    if dups:
+        parser.error(f"Inputs share output file names: {dups}")
+    report = apply_audio_chain_batch(wav_ins, wav_outs, config, batch_size=args.batch_size)
+    print(json.dumps(report, indent=2))
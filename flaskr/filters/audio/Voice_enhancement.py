@@ -3,26 +3,43 @@
 import numpy as np
 from scipy.signal import butter, lfilter
 
+from .batching import lfilter_batch, normalize_peaks
+from .streaming import lfilter_stream, limiter_stream
 
-def pre_emphasis(signal: np.ndarray, alpha: float = 0.97) -> np.ndarray:
+
+def pre_emphasis(signal: np.ndarray,
+                 alpha: float = 0.97,
+                 axis: int = 0,
+                 prev: np.ndarray | None = None) -> np.ndarray:
     """
     Pre-emphasis filter:
     y[n] = x[n] - alpha * x[n-1]
 
-    Supports mono (N,) and stereo (N, C)
+    Supports mono (N,) and stereo (N, C); axis is the time axis (1 for a
+    batch). prev is the sample before the first one, e.g. the last sample of
+    the previous live frame; without it the first sample passes through.
     """
-    signal = signal.astype(np.float32)
-
-    if signal.ndim == 1:
-        out = np.empty_like(signal)
-        out[0] = signal[0]
-        out[1:] = signal[1:] - alpha * signal[:-1]
-        return out
+    signal = np.moveaxis(signal.astype(np.float32), axis, 0)
 
     out = np.empty_like(signal)
-    out[0, :] = signal[0, :]
-    out[1:, :] = signal[1:, :] - alpha * signal[:-1, :]
-    return out
+    out[0] = signal[0] if prev is None else signal[0] - alpha * prev
+    out[1:] = signal[1:] - alpha * signal[:-1]
+    return np.moveaxis(out, 0, axis)
+
+
+def _bandpass_design(fs: int,
+                     lowcut: float = 300.0,
+                     highcut: float = 3400.0,
+                     order: int = 4):
+    nyquist = 0.5 * fs
+    low = lowcut / nyquist
+    high = min(highcut / nyquist, 0.99)
+    return butter(order, [low, high], btype="bandpass")
+
+
+def _highpass_design(fs: int, cutoff: float, order: int = 2):
+    nyquist = 0.5 * fs
+    return butter(order, min(cutoff / nyquist, 0.99), btype="highpass")
 
 
 def bandpass_filter(signal: np.ndarray,
@@ -33,11 +50,25 @@ def bandpass_filter(signal: np.ndarray,
     """
     Butterworth band-pass filter for voice frequencies
     """
-    nyquist = 0.5 * fs
-    low = lowcut / nyquist
-    high = min(highcut / nyquist, 0.99)
+    b, a = _bandpass_design(fs, lowcut, highcut, order)
+
+    if signal.ndim == 1:
+        return lfilter(b, a, signal)
+
+    filtered = np.zeros_like(signal)
+    for ch in range(signal.shape[1]):
+        filtered[:, ch] = lfilter(b, a, signal[:, ch])
+    return filtered
 
-    b, a = butter(order, [low, high], btype="bandpass")
+
+def highpass_filter(signal: np.ndarray,
+                    fs: int,
+                    cutoff: float,
+                    order: int = 2) -> np.ndarray:
+    """
+    Butterworth high-pass filter
+    """
+    b, a = _highpass_design(fs, cutoff, order)
 
     if signal.ndim == 1:
         return lfilter(b, a, signal)
@@ -50,13 +81,16 @@ def bandpass_filter(signal: np.ndarray,
 
 def voice_enhancement(signal: np.ndarray,
                       fs: int,
-                      alpha: float = 0.97) -> np.ndarray:
+                      alpha: float = 0.97,
+                      cutoff: float = 0.0) -> np.ndarray:
     """
     Full pipeline:
-    Pre-emphasis → Band-pass
+    Pre-emphasis → Band-pass → High-pass (only if cutoff > 0 Hz)
     """
     emphasized = pre_emphasis(signal, alpha)
     enhanced = bandpass_filter(emphasized, fs)
+    if cutoff > 0:
+        enhanced = highpass_filter(enhanced, fs, cutoff)
 
     # Normalize to avoid clipping
     peak = np.max(np.abs(enhanced))
@@ -64,3 +98,49 @@ def voice_enhancement(signal: np.ndarray,
         enhanced = enhanced / peak
 
     return enhanced
+
+
+def voice_enhancement_batch(batch: np.ndarray,
+                            lengths: np.ndarray,
+                            fs: int,
+                            alpha: float = 0.97,
+                            cutoff: float = 0.0) -> np.ndarray:
+    """
+    voice_enhancement over a padded batch (B, N) or (B, N, C)
+    """
+    emphasized = pre_emphasis(batch, alpha, axis=1)
+
+    b, a = _bandpass_design(fs)
+    enhanced = lfilter_batch(b, a, emphasized)
+    if cutoff > 0:
+        b, a = _highpass_design(fs, cutoff)
+        enhanced = lfilter_batch(b, a, enhanced)
+
+    return normalize_peaks(enhanced, lengths)
+
+
+def voice_enhancement_stream(fs: int,
+                             channels: int,
+                             alpha: float = 0.97,
+                             cutoff: float = 0.0):
+    """
+    voice_enhancement on live (n, C) frames; the pre-emphasis carries the
+    previous frame's last sample and a limiter replaces peak normalization.
+    """
+    bandpass = lfilter_stream(*_bandpass_design(fs), channels)
+    highpass = lfilter_stream(*_highpass_design(fs, cutoff), channels) if cutoff > 0 else None
+    limiter = limiter_stream(fs)
+    prev = np.zeros(channels, dtype=np.float32)
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        nonlocal prev
+        if len(frame) == 0:
+            return frame
+        emphasized = pre_emphasis(frame, alpha, prev=prev)
+        prev = frame[-1].astype(np.float32)
+        enhanced = bandpass(emphasized)
+        if highpass is not None:
+            enhanced = highpass(enhanced)
+        return limiter(enhanced)
+
+    return process
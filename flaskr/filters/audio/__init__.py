@@ -5,8 +5,8 @@ The template uses these keys:
   gainCompressor, voiceEnhancement, denoiseDelay, phone, car
 """
 
-from .gain_compression import gain_compress
-from .Voice_enhancement import voice_enhancement
+from .gain_compression import gain_compress, gain_compress_batch, gain_compress_stream
+from .Voice_enhancement import voice_enhancement, voice_enhancement_batch, voice_enhancement_stream
 
 # wrappers to normalize interface to: apply(samples, fs, params) -> samples
 def _gainCompressor_apply(samples, fs, params):
@@ -20,8 +20,32 @@ def _voiceEnhancement_apply(samples, fs, params):
     cutoff = float(params.get("highPassFilter", 0.0))
     return voice_enhancement(samples, fs=fs, alpha=alpha, cutoff=cutoff)
 
-from .phone import apply as phone_apply
-from .car import apply as car_apply
+# batched variants: apply_batch(batch, lengths, fs, params) -> batch
+# (see batching.py for the batch layout)
+def _gainCompressor_apply_batch(batch, lengths, fs, params):
+    threshold = float(params.get("gainCompressorThreshold", params.get("threshold", 0.2)))
+    ratio = float(params.get("ratio", 4.0))
+    return gain_compress_batch(batch, lengths, threshold=threshold, ratio=ratio)
+
+def _voiceEnhancement_apply_batch(batch, lengths, fs, params):
+    alpha = float(params.get("preemphasisAlpha", 0.97))
+    cutoff = float(params.get("highPassFilter", 0.0))
+    return voice_enhancement_batch(batch, lengths, fs=fs, alpha=alpha, cutoff=cutoff)
+
+# live variants: stream(fs, channels, params) -> process(frame) -> frame
+# (see streaming.py; filter state is carried between frames)
+def _gainCompressor_stream(fs, channels, params):
+    threshold = float(params.get("gainCompressorThreshold", params.get("threshold", 0.2)))
+    ratio = float(params.get("ratio", 4.0))
+    return gain_compress_stream(threshold=threshold, ratio=ratio)
+
+def _voiceEnhancement_stream(fs, channels, params):
+    alpha = float(params.get("preemphasisAlpha", 0.97))
+    cutoff = float(params.get("highPassFilter", 0.0))
+    return voice_enhancement_stream(fs, channels, alpha=alpha, cutoff=cutoff)
+
+from .phone import apply as phone_apply, apply_batch as phone_apply_batch, stream as phone_stream
+from .car import apply as car_apply, apply_batch as car_apply_batch, stream as car_stream
 
 AUDIO_FILTERS = {
     "gainCompressor": _gainCompressor_apply,
@@ -29,3 +53,17 @@ AUDIO_FILTERS = {
     "phone": phone_apply,
     "car": car_apply,
 }
+
+AUDIO_BATCH_FILTERS = {
+    "gainCompressor": _gainCompressor_apply_batch,
+    "voiceEnhancement": _voiceEnhancement_apply_batch,
+    "phone": phone_apply_batch,
+    "car": car_apply_batch,
+}
+
+AUDIO_STREAM_FILTERS = {
+    "gainCompressor": _gainCompressor_stream,
+    "voiceEnhancement": _voiceEnhancement_stream,
+    "phone": phone_stream,
+    "car": car_stream,
+}
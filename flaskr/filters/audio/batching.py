@@ -0,0 +1,57 @@
+"""
+Helpers for running audio filters over a batch of clips.
+
+A batch is the clips zero-padded to a common length and stacked on axis 0:
+(B, N) for mono or (B, N, C) for multichannel. lengths holds each clip's
+valid sample count. All filters are causal, so the padding never leaks into
+the valid samples; only whole-signal peaks have to skip it.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+def pad_stack(clips: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    lengths = np.array([len(x) for x in clips])
+    batch = np.zeros((len(clips), lengths.max()) + clips[0].shape[1:], dtype=clips[0].dtype)
+    for i, x in enumerate(clips):
+        batch[i, :len(x)] = x
+    return batch, lengths
+
+
+def unstack(batch: np.ndarray, lengths: np.ndarray) -> list[np.ndarray]:
+    return [batch[i, :n] for i, n in enumerate(lengths)]
+
+
+def _bshape(batch: np.ndarray) -> tuple:
+    # shape that broadcasts one value per clip against the batch
+    return (batch.shape[0],) + (1,) * (batch.ndim - 1)
+
+
+def masked_peak(batch: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Per-clip max(|x|) over the valid samples, shaped to broadcast against batch.
+    """
+    valid = np.arange(batch.shape[1]) < lengths[:, None]
+    valid = valid.reshape(valid.shape + (1,) * (batch.ndim - 2))
+    peak = np.where(valid, np.abs(batch), 0).max(axis=tuple(range(1, batch.ndim)))
+    return peak.reshape(_bshape(batch))
+
+
+def normalize_peaks(batch: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Batched form of the "if peak > 1.0: x = x / peak" step the filters share.
+    """
+    peak = masked_peak(batch, lengths)
+    return batch / np.where(peak > 1.0, peak, 1.0).astype(batch.dtype)
+
+
+def lfilter_batch(b, a, batch: np.ndarray) -> np.ndarray:
+    """
+    lfilter along the time axis. Matches the per-channel loop the filters use,
+    which writes multichannel output back into the input dtype.
+    """
+    out = lfilter(b, a, batch, axis=1)
+    if batch.ndim == 3:
+        out = out.astype(batch.dtype)
+    return out
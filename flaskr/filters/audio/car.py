@@ -1,16 +1,20 @@
 import numpy as np
 from scipy.signal import butter, lfilter
 
+from .batching import lfilter_batch, normalize_peaks
+from .streaming import lfilter_stream, limiter_stream
+
 
 def stereo_enhancement(signal: np.ndarray,side_gain: float = 1.5) -> np.ndarray:
     """
     Stereo enhancement by side amplification
+    Works on stereo signals (N, 2), or any (..., 2) array such as a batch
     """
-    if signal.ndim != 2 or signal.shape[1] != 2:
+    if signal.ndim < 2 or signal.shape[-1] != 2:
         return signal
 
-    left = signal[:, 0]
-    right = signal[:, 1]
+    left = signal[..., 0]
+    right = signal[..., 1]
 
     mid = (left + right) / 2.0
     side = (left - right) / 2.0
@@ -20,17 +24,20 @@ def stereo_enhancement(signal: np.ndarray,side_gain: float = 1.5) -> np.ndarray:
     out_left = mid + side
     out_right = mid - side
 
-    return np.stack((out_left, out_right), axis=1)
+    return np.stack((out_left, out_right), axis=-1)
+
+
+def _lowpass_design(fs: int, cutoff: float = 10000.0, order: int = 4):
+    nyquist = 0.5 * fs
+    normal_cutoff = cutoff / nyquist
+    return butter(order, normal_cutoff, btype='low')
 
 
 def lowpass_filter(signal: np.ndarray,fs: int,cutoff: float = 10000.0,order: int = 4) -> np.ndarray:
     """
     Butterworth low-pass filter
     """
-    nyquist = 0.5 * fs
-    normal_cutoff = cutoff / nyquist
-
-    b, a = butter(order, normal_cutoff, btype='low')
+    b, a = _lowpass_design(fs, cutoff, order)
 
     if signal.ndim == 1:
         return lfilter(b, a, signal)
@@ -59,3 +66,29 @@ def apply(samples: np.ndarray, fs: int, params: dict) -> np.ndarray:
     side_gain = float(params.get("sideGain", 1.5))
     return car_filter(samples, fs, side_gain)
 
+
+def apply_batch(batch: np.ndarray, lengths: np.ndarray, fs: int, params: dict) -> np.ndarray:
+    """
+    Batched form of apply() over a padded batch (B, N) or (B, N, C).
+    """
+    if batch.ndim == 3:
+        batch = stereo_enhancement(batch, float(params.get("sideGain", 1.5)))
+
+    b, a = _lowpass_design(fs)
+    filtered = lfilter_batch(b, a, batch)
+
+    return normalize_peaks(filtered, lengths)
+
+
+def stream(fs: int, channels: int, params: dict):
+    """
+    Live form of apply() on (n, C) frames; a limiter replaces peak normalization.
+    """
+    side_gain = float(params.get("sideGain", 1.5))
+    lowpass = lfilter_stream(*_lowpass_design(fs), channels)
+    limiter = limiter_stream(fs)
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        return limiter(lowpass(stereo_enhancement(frame, side_gain)))
+
+    return process
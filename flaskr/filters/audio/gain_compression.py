@@ -1,6 +1,17 @@
 import numpy as np
 from scipy.io import wavfile
 
+from .batching import masked_peak
+
+def _compress_curve(normalized: np.ndarray, threshold: float, ratio: float) -> np.ndarray:
+    """
+    Compression curve on peak-normalized samples: the part beyond +-threshold
+    is divided by ratio.
+    """
+    return np.where(normalized > threshold, threshold + (normalized - threshold) / ratio,
+                    np.where(normalized < -threshold, -threshold + (normalized + threshold) / ratio,
+                             normalized))
+
 def gain_compress(samples: np.ndarray, threshold: float = 0.2, ratio: float = 4.0) -> np.ndarray:
     """
     Simple gain compressor. Attenuates samples that exceed the threshold by a given ratio.
@@ -13,16 +24,37 @@ def gain_compress(samples: np.ndarray, threshold: float = 0.2, ratio: float = 4.
     else:
         normalized = samples
 
-    for i, x in np.ndenumerate(normalized):
-        if x > threshold:
-            normalized[i] = threshold + (x - threshold) / ratio
-        elif x < -threshold:
-            normalized[i] = -threshold + (x + threshold) / ratio
+    normalized = _compress_curve(normalized, threshold, ratio)
 
     # Scale back to original amplitude
     compressed = normalized * max_val
     return compressed
 
+def gain_compress_batch(batch: np.ndarray, lengths: np.ndarray, threshold: float = 0.2, ratio: float = 4.0) -> np.ndarray:
+    """
+    Vectorized gain_compress over a padded batch; each clip is normalized by its own peak.
+    """
+    max_val = masked_peak(batch, lengths)
+    normalized = batch / np.where(max_val > 0, max_val, 1).astype(batch.dtype)
+    return _compress_curve(normalized, threshold, ratio) * max_val
+
+def gain_compress_stream(threshold: float = 0.2, ratio: float = 4.0):
+    """
+    gain_compress on live frames. The whole-signal peak is not known yet, so
+    the peak seen so far is used to normalize.
+    """
+    max_val = 0.0
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        nonlocal max_val
+        if len(frame):
+            max_val = max(max_val, float(np.max(np.abs(frame))))
+        if max_val == 0:
+            return frame
+        return _compress_curve(frame / max_val, threshold, ratio) * max_val
+
+    return process
+
 def process_file(input_path: str, output_path: str, threshold: float = 0.2, ratio: float = 4.0):
     """
     Load a WAV file, apply gain compression, and save the result.
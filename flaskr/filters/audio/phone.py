@@ -1,18 +1,21 @@
 import numpy as np
 from scipy.signal import butter, lfilter
 
+from .batching import lfilter_batch, normalize_peaks
+from .streaming import lfilter_stream, limiter_stream
+
 
 def mono_enhancement(signal: np.ndarray,
                      side_attenuation: float = 0.3) -> np.ndarray:
     """
     Mono enhancement by side attenuation
-    Works on stereo signals (N, 2)
+    Works on stereo signals (N, 2), or any (..., 2) array such as a batch
     """
-    if signal.ndim != 2 or signal.shape[1] != 2:
+    if signal.ndim < 2 or signal.shape[-1] != 2:
         return signal
 
-    left = signal[:, 0]
-    right = signal[:, 1]
+    left = signal[..., 0]
+    right = signal[..., 1]
 
     mid = (left + right) / 2.0
     side = (left - right) / 2.0
@@ -22,7 +25,17 @@ def mono_enhancement(signal: np.ndarray,
     mono_left = mid + side
     mono_right = mid - side
 
-    return np.stack((mono_left, mono_right), axis=1)
+    return np.stack((mono_left, mono_right), axis=-1)
+
+
+def _bandpass_design(fs: int,
+                     lowcut: float = 800.0,
+                     highcut: float = 12000.0,
+                     order: int = 4):
+    nyquist = 0.5 * fs
+    low = lowcut / nyquist
+    high = min(highcut / nyquist, 0.99)
+    return butter(order, [low, high], btype='bandpass')
 
 
 def bandpass_filter(signal: np.ndarray,
@@ -33,11 +46,7 @@ def bandpass_filter(signal: np.ndarray,
     """
     Butterworth band-pass filter for phone effect
     """
-    nyquist = 0.5 * fs
-    low = lowcut / nyquist
-    high = min(highcut / nyquist, 0.99)
-
-    b, a = butter(order, [low, high], btype='bandpass')
+    b, a = _bandpass_design(fs, lowcut, highcut, order)
 
     if signal.ndim == 1:
         return lfilter(b, a, signal)
@@ -73,6 +82,12 @@ def apply(samples: np.ndarray, fs: int, params: dict) -> np.ndarray:
       - phoneFilterOrder (int) [optional]
     """
 
+    side_att = _side_attenuation(params)
+
+    return phone_filter(samples, fs, side_attenuation=side_att)
+
+
+def _side_attenuation(params: dict) -> float:
     if "side_attenuation" in params:
         side_att = float(params.get("side_attenuation", 0.3))
     else:
@@ -81,6 +96,31 @@ def apply(samples: np.ndarray, fs: int, params: dict) -> np.ndarray:
         side_gain_db = float(params.get("phoneSideGain", -10.0))
         side_att = 10 ** (side_gain_db / 20.0)
 
-    side_att = max(0.0, min(1.0, side_att))
+    return max(0.0, min(1.0, side_att))
 
-    return phone_filter(samples, fs, side_attenuation=side_att)
+
+def apply_batch(batch: np.ndarray, lengths: np.ndarray, fs: int, params: dict) -> np.ndarray:
+    """
+    Batched form of apply() over a padded batch (B, N) or (B, N, C).
+    """
+    if batch.ndim == 3:
+        batch = mono_enhancement(batch, _side_attenuation(params))
+
+    b, a = _bandpass_design(fs)
+    filtered = lfilter_batch(b, a, batch)
+
+    return normalize_peaks(filtered, lengths)
+
+
+def stream(fs: int, channels: int, params: dict):
+    """
+    Live form of apply() on (n, C) frames; a limiter replaces peak normalization.
+    """
+    side_att = _side_attenuation(params)
+    bandpass = lfilter_stream(*_bandpass_design(fs), channels)
+    limiter = limiter_stream(fs)
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        return limiter(bandpass(mono_enhancement(frame, side_att)))
+
+    return process
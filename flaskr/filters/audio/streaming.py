@@ -0,0 +1,53 @@
+"""
+Building blocks for running audio filters on live input.
+
+Stream filters process consecutive fixed-size frames shaped (n, C) and carry
+their state (filter delay lines, last sample, limiter gain) from one frame to
+the next, so the output matches filtering the whole signal at once. Each
+factory returns a process(frame) -> frame callable.
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+
+def lfilter_stream(b, a, channels: int):
+    """
+    lfilter with its delay line carried across frames.
+    """
+    zi = np.zeros((max(len(a), len(b)) - 1, channels))
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        nonlocal zi
+        out, zi = lfilter(b, a, frame, axis=0, zi=zi)
+        return out
+
+    return process
+
+
+def limiter_stream(fs: int, ceiling: float = 1.0, release_ms: float = 50.0):
+    """
+    Peak limiter without lookahead, used live in place of whole-signal peak
+    normalization. Gain drops instantly to keep every sample within ceiling
+    and recovers exponentially with the release time constant. The gain is
+    linked across channels.
+
+    Per sample, in log gain: g[n] = min(0, req[n], g[n-1] + c). Unrolled that
+    is a running minimum, so a frame is computed with minimum.accumulate.
+    """
+    c = 1000.0 / (release_ms * fs)
+    last = 0.0
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        nonlocal last
+        if len(frame) == 0:
+            return frame
+        level = np.abs(frame).max(axis=1)
+        req = np.minimum(0.0, np.log(ceiling / np.maximum(level, 1e-12)))
+        k = np.arange(len(level))
+        run = np.minimum.accumulate(req - c * k) + c * k
+        gain = np.minimum(0.0, np.minimum(run, last + c * (k + 1)))
+        last = gain[-1]
+        return frame * np.exp(gain)[:, None]
+
+    return process
@@ -1,20 +1,25 @@
 from pathlib import Path
 import subprocess
+import time
 import numpy as np
 from scipy.io import wavfile
 
-from filters.audio import AUDIO_FILTERS
+from filters.audio import AUDIO_FILTERS, AUDIO_BATCH_FILTERS, AUDIO_STREAM_FILTERS
+from filters.audio.batching import pad_stack, unstack
 from filters.video import VIDEO_FILTERS
+from profiling import Profiler, stage
 
 class FFmpegError(RuntimeError):
     pass
 
-def _run(cmd: list[str]) -> None:
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    if p.returncode != 0:
-        raise FFmpegError((p.stderr or "")[-4000:])
+def _run(cmd: list[str], profiler: Profiler | None = None, name: str = "ffmpeg") -> None:
+    with stage(profiler, "ffmpeg", name):
+        p = subprocess.run(cmd, capture_output=True, text=True)
+        if p.returncode != 0:
+            raise FFmpegError((p.stderr or "")[-4000:])
 
-def extract_audio(video_path: Path, wav_path: Path, fs: int = 48000) -> None:
+def extract_audio(video_path: Path, wav_path: Path, fs: int = 48000,
+                  profiler: Profiler | None = None) -> None:
     wav_path.parent.mkdir(parents=True, exist_ok=True)
     _run([
         "ffmpeg", "-y",
@@ -23,7 +28,7 @@ def extract_audio(video_path: Path, wav_path: Path, fs: int = 48000) -> None:
         "-acodec", "pcm_s16le",
         "-ar", str(fs),
         str(wav_path)
-    ])
+    ], profiler, "extract_audio")
 
 def _read_wav_float(path: Path) -> tuple[int, np.ndarray]:
     fs, data = wavfile.read(str(path))
@@ -33,20 +38,90 @@ def _read_wav_float(path: Path) -> tuple[int, np.ndarray]:
         x = data.astype(np.float32)
     return fs, x
 
+def _wav_shape(path: Path) -> tuple[int, tuple]:
+    # memory-mapped read: only the header is parsed, no samples are loaded
+    try:
+        fs, data = wavfile.read(str(path), mmap=True)
+    except ValueError:
+        # formats scipy cannot memory-map (e.g. 24-bit PCM); the samples are
+        # read once and dropped, so memory stays at one clip
+        fs, data = wavfile.read(str(path))
+    return fs, data.shape
+
 def _write_wav_float(path: Path, fs: int, samples: np.ndarray) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     x = np.clip(samples, -1.0, 1.0)
     wavfile.write(str(path), fs, (x * 32767).astype(np.int16))
 
-def apply_audio_chain(wav_in: Path, wav_out: Path, config: dict) -> None:
+def apply_audio_chain(wav_in: Path, wav_out: Path, config: dict,
+                      profiler: Profiler | None = None) -> None:
     fs, samples = _read_wav_float(wav_in)
-    for item in config.get("audio", []):
+    for i, item in enumerate(config.get("audio", [])):
         name = item["name"]
         params = item.get("params", {}) or {}
-        samples = AUDIO_FILTERS[name](samples, fs, params)
+        with stage(profiler, "audio", name, index=i):
+            samples = AUDIO_FILTERS[name](samples, fs, params)
     _write_wav_float(wav_out, fs, samples)
 
-def apply_video_and_mux(video_in: Path, audio_wav: Path, video_out: Path, config: dict) -> None:
+def apply_audio_chain_batch(wav_ins: list[Path], wav_outs: list[Path], config: dict,
+                            batch_size: int = 64, profiler: Profiler | None = None) -> dict:
+    """
+    Run the audio chain over many clips at once. Clips sharing a sample rate and
+    channel count are sorted by length, padded and stacked into batches of up to
+    batch_size, and each filter runs once per batch. Grouping only reads WAV
+    headers and samples are loaded one batch at a time, so memory is bounded
+    by batch_size. Returns a throughput report.
+    """
+    t0 = time.perf_counter()
+    shapes = [_wav_shape(p) for p in wav_ins]
+
+    groups = {}
+    for i, (fs, shape) in enumerate(shapes):
+        groups.setdefault((fs, shape[1:]), []).append(i)
+
+    n_batches = 0
+    for (fs, _), idx in groups.items():
+        idx.sort(key=lambda i: shapes[i][1][0])
+        for start in range(0, len(idx), batch_size):
+            chunk = idx[start:start + batch_size]
+            batch, lengths = pad_stack([_read_wav_float(wav_ins[i])[1] for i in chunk])
+            for item in config.get("audio", []):
+                name = item["name"]
+                params = item.get("params", {}) or {}
+                with stage(profiler, "audio", name, batch=n_batches, clips=len(chunk)):
+                    batch = AUDIO_BATCH_FILTERS[name](batch, lengths, fs, params)
+            for i, samples in zip(chunk, unstack(batch, lengths)):
+                _write_wav_float(wav_outs[i], fs, samples)
+            n_batches += 1
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "clips": len(wav_ins),
+        "batches": n_batches,
+        "seconds": elapsed,
+        "clips_per_second": len(wav_ins) / elapsed if elapsed > 0 else None,
+    }
+
+def build_stream_chain(config: dict, fs: int, channels: int):
+    """
+    Live counterpart of apply_audio_chain: returns process(frame) -> frame for
+    (n, channels) float frames, with each filter keeping its own state.
+    """
+    stages = []
+    for item in config.get("audio", []):
+        name = item["name"]
+        params = item.get("params", {}) or {}
+        stages.append(AUDIO_STREAM_FILTERS[name](fs, channels, params))
+
+    def process(frame: np.ndarray) -> np.ndarray:
+        for f in stages:
+            frame = f(frame)
+        return frame
+
+    return process
+
+def apply_video_and_mux(video_in: Path, audio_wav: Path, video_out: Path, config: dict,
+                        profiler: Profiler | None = None) -> None:
     vf_parts = []
     for item in config.get("video", []):
         name = item["name"]
@@ -68,13 +143,14 @@ def apply_video_and_mux(video_in: Path, audio_wav: Path, video_out: Path, config
         "-movflags", "+faststart",
         str(video_out)
     ]
-    _run(cmd)
+    _run(cmd, profiler, "video_and_mux")
 
-def apply_pipeline(input_video: Path, output_video: Path, config: dict, tmp_dir: Path) -> None:
+def apply_pipeline(input_video: Path, output_video: Path, config: dict, tmp_dir: Path,
+                   profiler: Profiler | None = None) -> None:
     tmp_dir.mkdir(parents=True, exist_ok=True)
     wav_in = tmp_dir / "audio_in.wav"
     wav_out = tmp_dir / "audio_out.wav"
 
-    extract_audio(input_video, wav_in)
-    apply_audio_chain(wav_in, wav_out, config)
-    apply_video_and_mux(input_video, wav_out, output_video, config)
+    extract_audio(input_video, wav_in, profiler=profiler)
+    apply_audio_chain(wav_in, wav_out, config, profiler)
+    apply_video_and_mux(input_video, wav_out, output_video, config, profiler)
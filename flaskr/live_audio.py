@@ -0,0 +1,229 @@
+"""
+Apply an audio filter config to live raw PCM (s16le, interleaved).
+
+    python live_audio.py config.json --input tcp://127.0.0.1:9000
+    python live_audio.py config.json --ffmpeg-input "-re -f lavfi -i sine=f=440:d=10" --output out.pcm
+
+Input is "-" (stdin), tcp://HOST:PORT or unix:PATH (listen and accept one
+feed), or an ffmpeg input given with --ffmpeg-input. Output goes back over
+the socket for socket inputs and to stdout otherwise, unless --output names
+"-" or a file.
+
+Audio is processed in fixed-size frames. Each frame is due at the later of
+when it was read and when the stream's sample clock (started by the first
+frame) reaches it, so input that arrives faster than real time is not
+penalised. The latency bound is one frame plus --queue-frames frame periods.
+A frame is dropped (overrun) unless it can still be processed and written
+inside that bound, judged from the slowest recent process + write time. A
+frame that comes out more than one frame period after it was due is counted
+as an xrun, and one that exceeds the bound anyway as a late frame. The
+report (counters and end-to-end latency) is printed to stderr as JSON.
+"""
+
+from collections import deque
+from pathlib import Path
+import argparse
+import json
+import os
+import queue
+import shlex
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from helpers import build_stream_chain
+from filters.audio import AUDIO_STREAM_FILTERS
+
+
+def _read_exact(f, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = f.read(n - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
+def run_live(read, write, config: dict, fs: int = 48000, channels: int = 2,
+             frame_size: int = 256, queue_frames: int = 4) -> dict:
+    """
+    Filter frames from read(n) -> bytes and pass the result to write(bytes)
+    until read returns a short frame. Returns the latency/xrun report.
+    """
+    process = build_stream_chain(config, fs, channels)
+    frame_s = frame_size / fs
+    frame_bytes = frame_size * channels * 2
+    max_wait = queue_frames * frame_s
+    bound = frame_s + max_wait
+    # frames are dropped by age below; the cap only holds back input that is
+    # read far faster than real time (e.g. a file on stdin)
+    q = queue.Queue(maxsize=16 * queue_frames)
+    # each thread owns its counters; the reader's are merged after join()
+    reader_stats = {"frames_in": 0}
+    stats = {"frames_out": 0, "overruns": 0, "xruns": 0, "late_frames": 0}
+    # recent process + write times; their max is the per-frame budget
+    service = deque(maxlen=32)
+    dropped_in_row = 0
+
+    def reader():
+        start = None
+        while True:
+            data = read(frame_bytes)
+            data = data[:len(data) - len(data) % (channels * 2)]
+            if data:
+                now = time.perf_counter()
+                if start is None:
+                    start = now
+                due = max(now, start + reader_stats["frames_in"] * frame_s)
+                reader_stats["frames_in"] += 1
+                q.put((due, data))
+            if len(data) < frame_bytes:
+                q.put(None)
+                return
+
+    t = threading.Thread(target=reader, daemon=True)
+    t.start()
+
+    latencies = []
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        due, data = item
+        start = time.perf_counter()
+        budget = max(service, default=0.0)
+        # after a run of drops, let one frame through to re-measure the budget
+        if start - due > max_wait - budget and dropped_in_row < queue_frames:
+            stats["overruns"] += 1
+            dropped_in_row += 1
+            continue
+        dropped_in_row = 0
+
+        x = np.frombuffer(data, dtype=np.int16).reshape(-1, channels).astype(np.float32) / 32767.0
+        y = process(x)
+        write((np.clip(y, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+        done = time.perf_counter()
+        service.append(done - start)
+        if done - due > frame_s:
+            stats["xruns"] += 1
+        # the frame's first sample also waited one frame period to be captured
+        latency = max(done - due, 0.0) + len(x) / fs
+        if latency > bound:
+            stats["late_frames"] += 1
+        latencies.append(latency)
+        stats["frames_out"] += 1
+
+    t.join()
+    lat = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        **reader_stats,
+        **stats,
+        "fs": fs,
+        "channels": channels,
+        "frame_size": frame_size,
+        "frame_ms": frame_s * 1000,
+        "latency_bound_ms": bound * 1000,
+        "processing_budget_ms": max(service, default=0.0) * 1000,
+        "latency_ms": {
+            "mean": float(lat.mean() * 1000),
+            "p99": float(np.percentile(lat, 99) * 1000),
+            "max": float(lat.max() * 1000),
+        },
+    }
+
+
+def _accept(spec: str) -> socket.socket:
+    if spec.startswith("tcp://"):
+        host, port = spec[len("tcp://"):].rsplit(":", 1)
+        server = socket.create_server((host, int(port)))
+    elif spec.startswith("unix:"):
+        path = spec[len("unix:"):]
+        # only clear a stale socket, never a regular file
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise ValueError(f"{path} exists and is not a socket")
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+    else:
+        raise ValueError(f"Unsupported input: {spec}")
+    conn, _ = server.accept()
+    server.close()
+    if spec.startswith("tcp://"):
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return conn
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply an audio filter chain to live PCM.")
+    parser.add_argument("config", help="Path to JSON config with an 'audio' list")
+    parser.add_argument("--input", default="-", help="'-', tcp://HOST:PORT or unix:PATH")
+    parser.add_argument("--ffmpeg-input", help="ffmpeg input arguments to capture from instead of --input")
+    parser.add_argument("--output", help="'-' or a file path (default: back over the socket, else stdout)")
+    parser.add_argument("--fs", type=int, default=48000, help="Sample rate")
+    parser.add_argument("--channels", type=int, default=2, help="Channel count")
+    parser.add_argument("--frame-size", type=int, default=256, help="Samples per frame")
+    parser.add_argument("--queue-frames", type=int, default=4, help="Frame periods a frame may wait before it is dropped")
+    args = parser.parse_args()
+
+    for opt in ("fs", "channels", "frame_size", "queue_frames"):
+        if getattr(args, opt) < 1:
+            parser.error(f"--{opt.replace('_', '-')} must be at least 1")
+
+    config = json.loads(Path(args.config).read_text())
+    for item in config.get("audio", []):
+        if item.get("name") not in AUDIO_STREAM_FILTERS:
+            parser.error(f"Unknown audio filter: {item.get('name')}")
+    if not args.ffmpeg_input and args.input != "-":
+        if args.input.startswith("tcp://"):
+            host, _, port = args.input[len("tcp://"):].rpartition(":")
+            if not host or not port.isdigit():
+                parser.error(f"Expected tcp://HOST:PORT, got {args.input}")
+        elif not args.input.startswith("unix:") or args.input == "unix:":
+            parser.error(f"--input must be '-', tcp://HOST:PORT or unix:PATH, got {args.input}")
+        else:
+            path = args.input[len("unix:"):]
+            if os.path.lexists(path) and not stat.S_ISSOCK(os.lstat(path).st_mode):
+                parser.error(f"{path} exists and is not a socket")
+
+    conn = proc = sink = None
+    if args.ffmpeg_input:
+        proc = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "error", *shlex.split(args.ffmpeg_input),
+             "-f", "s16le", "-ac", str(args.channels), "-ar", str(args.fs), "-"],
+            stdout=subprocess.PIPE,
+        )
+        source = proc.stdout
+    elif args.input == "-":
+        source = sys.stdin.buffer
+    else:
+        conn = _accept(args.input)
+        source = conn.makefile("rb")
+
+    if args.output and args.output != "-":
+        sink = open(args.output, "wb")
+        write = sink.write
+    elif conn is not None and args.output is None:
+        write = conn.sendall
+    else:
+        write = sys.stdout.buffer.write
+
+    try:
+        report = run_live(lambda n: _read_exact(source, n), write, config, fs=args.fs, channels=args.channels,
+                          frame_size=args.frame_size, queue_frames=args.queue_frames)
+    finally:
+        if sink is not None:
+            sink.close()
+        if proc is not None:
+            proc.kill()
+        if conn is not None:
+            conn.close()
+    print(json.dumps(report, indent=2), file=sys.stderr)
@@ -4,6 +4,7 @@ from flask import Flask, request, jsonify, render_template, send_file
 from werkzeug.utils import secure_filename
 
 from helpers import apply_pipeline
+from profiling import Profiler
 from filters.audio import AUDIO_FILTERS
 from filters.video import VIDEO_FILTERS
 
@@ -14,6 +15,7 @@ UPLOAD_DIR = ROOT / "static" / "uploads"
 PROCESSED_DIR = ROOT / "static" / "processed"
 TMP_DIR = ROOT / "static" / "tmp"
 ALLOWED = {".mp4", ".mov", ".mkv", ".webm", ".avi"}
+PROFILE_MODES = (False, True, "cprofile")
 
 STATE = {
     "uploaded": False,
@@ -22,11 +24,25 @@ STATE = {
     "input_path": None,
     "output_path": None,
     "config": None,
+    "profile": None,
 }
 
 def ok(**k): return jsonify({"ok": True, **k})
 def err(msg, code=400, **k): return jsonify({"ok": False, "error": msg, **k}), code
 
+def profile_mode():
+    """
+    Profiling is off unless enabled by the config ("profile": true | "cprofile")
+    or by the /apply query string (?profile=1 | ?profile=cprofile).
+    """
+    q = request.args.get("profile")
+    if q is not None:
+        q = q.lower()
+        if q == "cprofile":
+            return "cprofile"
+        return q in ("1", "true", "yes", "on")
+    return (STATE["config"] or {}).get("profile", False)
+
 @app.get("/")
 def home():
     return render_template("project_template.html")
@@ -67,6 +83,7 @@ def upload():
         "input_path": str(ip),
         "output_path": None,
         "config": None,
+        "profile": None,
     })
     return ok(message="Uploaded", filename=name)
 
@@ -88,6 +105,7 @@ def delete():
         "input_path": None,
         "output_path": None,
         "config": None,
+        "profile": None,
     })
     return ok(message="Deleted")
 
@@ -120,6 +138,9 @@ def configure():
             return err("Video params must be an object.", 400)
         item.setdefault("params", {})
 
+    if cfg.get("profile", False) not in PROFILE_MODES:
+        return err("'profile' must be true, false or \"cprofile\".", 400)
+
     STATE["config"] = cfg
     STATE["configured"] = True
     return ok(message="Configured", config=cfg)
@@ -139,10 +160,22 @@ def apply():
 
     out = PROCESSED_DIR / "output.mp4"
 
+    mode = profile_mode()
+    STATE["profile"] = None
+    profiler = Profiler(cprofile=mode == "cprofile") if mode else None
+
     try:
-        apply_pipeline(ip, out, STATE["config"] or {}, TMP_DIR)
+        if profiler:
+            profiler.start()
+        try:
+            apply_pipeline(ip, out, STATE["config"] or {}, TMP_DIR, profiler)
+        finally:
+            if profiler:
+                profiler.stop()
+                STATE["profile"] = profiler.write(PROCESSED_DIR / "profile.json",
+                                                  PROCESSED_DIR / "profile.pstats")
     except Exception as e:
-        return err("Processing failed.", 500, details=str(e))
+        return err("Processing failed.", 500, details=str(e), profile=STATE["profile"])
 
     # requirement: delete original after successful processing
     ip.unlink(missing_ok=True)
@@ -150,7 +183,8 @@ def apply():
     STATE["processed"] = True
     STATE["output_path"] = str(out)
 
-    return ok(message="Processed", static_url="/static/processed/output.mp4", stream_url="/stream")
+    return ok(message="Processed", static_url="/static/processed/output.mp4", stream_url="/stream",
+              profile=STATE["profile"])
 
 @app.get("/stream")
 def stream():
@@ -0,0 +1,116 @@
+"""
+Opt-in per-job profiling.
+
+A Profiler collects one record per pipeline stage (each audio filter call and
+each ffmpeg subprocess) with wall/CPU time, tracemalloc peak and net
+allocation, and the rusage of child processes spawned during the stage.
+"""
+
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+import cProfile
+import json
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _children_rusage() -> dict | None:
+    if resource is None:
+        return None
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {"user_s": ru.ru_utime, "sys_s": ru.ru_stime, "maxrss_kb": ru.ru_maxrss}
+
+
+class Profiler:
+    def __init__(self, cprofile: bool = False):
+        self.stages: list[dict] = []
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._started_tracemalloc = False
+        self._t0 = None
+        self._cpu0 = None
+        self.wall_s = None
+        self.cpu_s = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.process_time() - self._cpu0
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, kind: str, name: str, **extra):
+        """
+        Time a single stage. kind is "audio" or "ffmpeg".
+        """
+        rec = {"kind": kind, "name": name, **extra}
+        children0 = _children_rusage()
+        mem0 = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield rec
+            rec["ok"] = True
+        except Exception:
+            rec["ok"] = False
+            raise
+        finally:
+            rec["wall_s"] = time.perf_counter() - t0
+            rec["cpu_s"] = time.process_time() - cpu0
+            mem1, peak = tracemalloc.get_traced_memory()
+            rec["tracemalloc_peak_bytes"] = peak - mem0
+            rec["tracemalloc_net_bytes"] = mem1 - mem0
+            children1 = _children_rusage()
+            if children0 is not None:
+                # maxrss is the largest child seen so far, not a delta
+                rec["children"] = {
+                    "user_s": children1["user_s"] - children0["user_s"],
+                    "sys_s": children1["sys_s"] - children0["sys_s"],
+                    "maxrss_kb": children1["maxrss_kb"],
+                }
+            self.stages.append(rec)
+
+    def report(self, pstats_path: Path | None = None) -> dict:
+        if self._cprofile is not None and pstats_path is not None:
+            pstats_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(str(pstats_path))
+        else:
+            pstats_path = None
+        return {
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "stages": self.stages,
+            "pstats_path": str(pstats_path) if pstats_path else None,
+        }
+
+    def write(self, json_path: Path, pstats_path: Path | None = None) -> dict:
+        rep = self.report(pstats_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(rep, indent=2))
+        return rep
+
+
+def stage(profiler: Profiler | None, kind: str, name: str, **extra):
+    """
+    Profiler.stage when profiling is on, a no-op context otherwise.
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(kind, name, **extra)